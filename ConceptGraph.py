@@ -5,8 +5,53 @@
 
 from nltk.corpus import wordnet as wn
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 import json
+import warnings
+from collections.abc import Set
+from functools import lru_cache
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional, without it the compiled helpers below run as plain Python
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+# WordNet is immutable, so synset lookups can be memoized for the whole session
+@lru_cache(maxsize=None)
+def _cached_synset(name):
+    return wn.synset(name)
+
+@lru_cache(maxsize=None)
+def _cached_synsets(word):
+    return wn.synsets(word)
+
+# Note that hypernym_paths returns a list containing only one element which is a list of synsets
+@lru_cache(maxsize=None)
+def _cached_hypernym_names(name):
+    return frozenset(s.name() for s in _cached_synset(name).hypernym_paths()[0])
+
+# Fills the ancestor bitmask matrix 'anc' of a DAG whose rows are in topological order
+# The parents of row i are parents_indices[parents_indptr[i]:parents_indptr[i + 1]] (CSR layout)
+# Returns the rows (i, j) of the first redundant edge j -> i found, or (-1, -1)
+@njit(cache=True, boundscheck=False)
+def _propagate_ancestor_bitmasks(anc, parents_indptr, parents_indices):
+    one = np.uint64(1)
+    for i in range(anc.shape[0]):
+        start, end = parents_indptr[i], parents_indptr[i + 1]
+        for k in range(start, end):
+            anc[i] |= anc[parents_indices[k]]
+        # a parent reachable through another parent makes the edge from it redundant
+        for k in range(start, end):
+            j = parents_indices[k]
+            if anc[i, j >> 6] & (one << np.uint64(j & 63)):
+                return i, j
+        for k in range(start, end):
+            j = parents_indices[k]
+            anc[i, j >> 6] |= one << np.uint64(j & 63)
+    return -1, -1
 
 # This class represents a node of a concept graph.
 class ConceptNode:
@@ -25,23 +70,23 @@ class ConceptNode:
         except:
             raise Exception("ConceptNode constructor:" + name + " is not the name of a WordNet synset")
         else:
-            #serialization to JSON cannot work with sets
-            self.descriptors = list(descriptors)
+            self.descriptors = set(descriptors)
             self.synset_name = name
 
     @staticmethod
     def valid_types(descriptors, name):
         return len(descriptors) != 0 \
                 and type(name) == str and type(descriptors) == set \
-                and all(map(lambda x: type(x) == str, list(descriptors)))
+                and all(type(x) is str for x in descriptors)
 
     @staticmethod
     # Exception on executing wn.synset(name) if 'name' is not that of a WordNet synset
     # wn.synsets(descriptor) evaluates to an empty list if descriptor not in WordNet
     def valid_args(descriptors, name):
-        return len(descriptors) != 0\
-                and wn.synset(name).pos() == 'n' \
-                and all(map(lambda x: len(wn.synsets(x)) != 0 and wn.synset(name) in wn.synsets(x), list(descriptors)))
+        target = _cached_synset(name)
+        return len(descriptors) != 0 \
+                and target.pos() == 'n' \
+                and all(target in _cached_synsets(x) for x in descriptors)
 
     # If all nodes are created using the methods defined here it is not possible
     # to create invalid nodes, so this method is not really necessary
@@ -53,7 +98,7 @@ class ConceptNode:
     # Exception with informative message if descriptor is a member of multiple WordNet synsets
     @classmethod
     def from_descriptor(cls, descriptor):
-        synsets = wn.synsets(descriptor)
+        synsets = _cached_synsets(descriptor)
         num_synsets = len(synsets)
         if num_synsets == 0:
             # descriptors that are not in Wordnet are currently not allowed
@@ -61,36 +106,37 @@ class ConceptNode:
         elif num_synsets == 1:
             name = synsets[0].name()
         else:
-            all_synonyms = []
-            for synset in synsets:
-                synonyms = []
-                for lemma_name in synset.lemma_names():
-                    synonyms.append(lemma_name)
-                all_synonyms.append(synset.name() + ": " + ", ".join(synonyms))
-            message = "\n".join(all_synonyms)
+            message = "\n".join(synset.name() + ": " + ", ".join(synset.lemma_names()) for synset in synsets)
             raise Exception("from_descriptor:" + descriptor + "has multiple meanings." \
                             + "Please create node using one of the following synset names:\n " \
                             + message)
+        # the constructor reuses the cached synsets of 'descriptor', only the synset lookup by name is new
         return cls({descriptor}, name)
 
     # Adds a new synonym to the current node
     # Exception if the new descriptor is not a synonym of the existing node descriptors
     def add_descriptor(self, descriptor):
-        # Recall that self.descriptors is a list not a set
         if descriptor in self.descriptors:
             pass  # si descriptor ya presente, no hacer nada
         elif self.valid_add_descriptor(descriptor):
             self.descriptors.add(descriptor)
 
     def valid_add_descriptor(self, descriptor):
-        if wn.synset(self.synset_name) not in wn.synsets(descriptor):
+        if _cached_synset(self.synset_name) not in _cached_synsets(descriptor):
             raise Exception("valid_add_descriptor:" + descriptor + "not a synonym")
         return True
 
+    # Names of the synsets on the WordNet hypernym path of this node
+    # Not stored as an attribute so that it does not end up in the NetworkX node data
+    @property
+    def _hypernym_names(self):
+        return _cached_hypernym_names(self.synset_name)
+
     def __str__(self):
         return str(self.id_networkx) + "( " + str(self.descriptors) + ", " + self.synset_name + " )"
 
     # Checks that the attributes are equal
+    # Descriptors are stored as sets, so the order in which they were added does not matter
     def __eq__(self,other):
         if isinstance(other, ConceptNode):
             return self.descriptors == other.descriptors and \
@@ -102,7 +148,7 @@ class ConceptNode:
         contains = False
         if type(elem) == str:
             # string has syntax of a synset_name
-            if len(elem.split('.')) == 3:
+            if elem.count('.') == 2:
                 contains = (elem == self.synset_name)
             else:
                 contains = (elem in self.descriptors)
@@ -129,7 +175,7 @@ class ConceptEdge:
         if isinstance(other, ConceptEdge):
             return self.source == other.source and \
                    self.target == other.target and \
-                   self.label == other.label if self.label is not None else True
+                   self.label == other.label
         else:
             return NotImplemented
 
@@ -143,28 +189,121 @@ class ConceptEdge:
         return hash((self.source, self.target))
 
 
+# Read-only set view of the nodes of a concept graph, backed by its id -> node dict
+class _ConceptNodeView(Set):
+
+    def __init__(self, id_to_node):
+        self._id_to_node = id_to_node
+
+    def __contains__(self, elem):
+        return isinstance(elem, ConceptNode) and self._id_to_node.get(elem.id_networkx) == elem
+
+    def __iter__(self):
+        return iter(self._id_to_node.values())
+
+    def __len__(self):
+        return len(self._id_to_node)
+
+
 # This class is used to represent concept graphs
 # A ConceptGraph object is currently a wrapper for a NetworkX DiGraph
 class ConceptGraph:
-
-    def __init__(self, nodes=set(), edges=set(), graph=nx.DiGraph()):
-        self.nodes = nodes
-        self.edges = edges
-        self.graph = graph
-
+    # range of sizes of the graphs checked with the N x N/64 bitmask matrix of valid_graph_structure:
+    # smaller ones are checked faster with sets than it takes to compile or load the numba kernel,
+    # larger ones would need too large a matrix
+    bitmask_min_nodes = 2000
+    bitmask_max_nodes = 10000
+
+    # The wrapped graph is the only place where nodes and edges are stored
+    # If 'graph' is given, 'nodes' must be exactly the ConceptNodes of its ids and 'edges' must be empty
+    # since the graph already contains them; otherwise 'nodes' and 'edges' are added to a new empty graph
+    # Defaults are created per call: a default set() or DiGraph() would be shared by all instances
+    def __init__(self, nodes=None, edges=None, graph=None):
+        if graph is not None:
+            if edges:
+                raise Exception("ConceptGraph constructor: edges cannot be given together with a graph")
+            nodes = [] if nodes is None else list(nodes)
+            if len(nodes) != len(graph) or {node.id_networkx for node in nodes} != set(graph):
+                raise Exception("ConceptGraph constructor: nodes must be exactly the nodes of the graph")
+        self.graph = nx.DiGraph() if graph is None else graph
+        # id -> node, descriptor -> node and synset_name -> node, for O(1) lookups
+        self._id_to_node = dict()
+        self._descriptor_index = dict()
+        self._synset_index = dict()
+        if graph is not None:
+            for node in nodes:
+                self._index_node(node)
+        # id -> set of ids of its ancestors, kept up to date as edges are added
+        self._compute_ancestors()
+        # number of nodes without incoming edges
+        self._num_roots = sum(1 for id in self.graph if self.graph.in_degree(id) == 0)
+        # layout and labels used by show, valid while the number of nodes and edges is _layout_sig
+        self._layout_cache = None
+        self._labels_cache = None
+        self._layout_sig = None
+        if graph is None and (nodes or edges):
+            self.bulk_add(nodes or set(), edges or set())
+
+    @property
+    def nodes(self):
+        return _ConceptNodeView(self._id_to_node)
+
+    @property
+    def edges(self):
+        return {ConceptEdge(self._id_to_node[source], self._id_to_node[target], label)
+                for source, target, label in self.graph.edges(data='label')}
+
+    def _index_node(self, node):
+        self._id_to_node[node.id_networkx] = node
+        for descriptor in node.descriptors:
+            self._descriptor_index[descriptor] = node
+        self._synset_index[node.synset_name] = node
+
+    # Computes the ancestor sets of all the nodes of 'graph', visiting them in topological order
+    # With check=True, exception if the graph is not its own transitive reduction
+    @staticmethod
+    def _ancestor_sets(graph, check=False):
+        try:
+            order = list(nx.topological_sort(graph))
+        except nx.NetworkXUnfeasible:
+            raise Exception("valid_graph_structure: the graph contains a cycle")
+        ancestors = dict()
+        for id in order:
+            parents = list(graph.predecessors(id))
+            ancestors[id] = set()
+            for parent in parents:
+                ancestors[id] |= ancestors[parent]
+            # a parent reachable through another parent makes the edge from it redundant
+            if check:
+                for parent in parents:
+                    if parent in ancestors[id]:
+                        raise Exception("valid_graph_structure: the graph contains another path between "
+                                        + str(parent) + " and " + str(id))
+            ancestors[id].update(parents)
+        return ancestors
+
+    def _compute_ancestors(self, check=False):
+        self._ancestors = self._ancestor_sets(self.graph, check)
+
+    # Deprecated: linear scan of 'a_nodeset', no longer used here
+    # The node of an id of the current graph is found in O(1) through self._id_to_node
     @classmethod
     def getNodeFromId(self, id_networkx, a_nodeset):
+        warnings.warn("getNodeFromId is deprecated, it scans the whole node set", DeprecationWarning, stacklevel=2)
         for x in a_nodeset:
             if id_networkx == x.id_networkx:
                 return x
 
+    # With validate=False the data is trusted to describe a valid graph and only node-level checks are run
     @classmethod
-    def from_json(cls, json_data):
+    def from_json(cls, json_data, validate=True):
         # Read jason_data into a networkx graph
         # Create an empty ConceptGraph:
         netx_graph = nx.readwrite.json_graph.node_link_graph(json.loads(json_data), directed=True, multigraph=False)
         node_set = set()
         edge_set = set()
+        # new nodes get fresh ids, so map the ids read from json to the new nodes
+        id_to_node = dict()
 
         for x in netx_graph.nodes:
             json_data = dict(netx_graph.nodes[x])
@@ -172,47 +311,162 @@ class ConceptGraph:
             s = json_data['synset_name']
             new_node = ConceptNode(set(d), s)
             node_set.add(new_node)
+            id_to_node[x] = new_node
 
-        for x in netx_graph.edges:
-            source = cls.getNodeFromId(x[0], node_set)
-            target = cls.getNodeFromId(x[1], node_set)
-            new_edge = ConceptEdge(source, target)
+        for x in netx_graph.edges(data='label'):
+            source = id_to_node[x[0]]
+            target = id_to_node[x[1]]
+            new_edge = ConceptEdge(source, target, x[2])
             edge_set.add(new_edge)
 
-        return cls(node_set,edge_set,netx_graph)
+        concept_graph = cls()
+        concept_graph.bulk_add(node_set, edge_set, validate)
+        return concept_graph
+
+    # Checks in a single pass that 'graph' is a DAG which is its own transitive reduction,
+    # which is what valid_graph_edge checks edge by edge
+    # Ancestor sets are rows of a bitmask matrix: bit j of row i is set if order[j] is an ancestor of order[i]
+    # Graphs outside bitmask_min_nodes..bitmask_max_nodes are checked with sets
+    @staticmethod
+    def valid_graph_structure(graph):
+        if not ConceptGraph.bitmask_min_nodes <= len(graph) <= ConceptGraph.bitmask_max_nodes:
+            ConceptGraph._ancestor_sets(graph, check=True)
+            return True
+        try:
+            order = list(nx.topological_sort(graph))
+        except nx.NetworkXUnfeasible:
+            raise Exception("valid_graph_structure: the graph contains a cycle")
+        row = {id: i for i, id in enumerate(order)}
+        parents_indptr = np.zeros(len(order) + 1, dtype=np.int64)
+        parents_indptr[1:] = np.cumsum([graph.in_degree(id) for id in order])
+        parents_indices = np.fromiter((row[parent] for id in order for parent in graph.predecessors(id)),
+                                      dtype=np.int64, count=parents_indptr[-1])
+        anc = np.zeros((len(order), (len(order) + 63) // 64), dtype=np.uint64)
+        i, j = _propagate_ancestor_bitmasks(anc, parents_indptr, parents_indices)
+        if i != -1:
+            raise Exception("valid_graph_structure: the graph contains another path between "
+                            + str(order[j]) + " and " + str(order[i]))
+        return True
 
-    def write_to_json(self):
+    def write_to_json(self, filename='networkdata10.json'):
         # Write the wrapped networkx graph to json
-        c = json.dumps(nx.readwrite.json_graph.node_link_data(self.graph))
-        with open('networkdata10.json', 'w') as outfile1:
-            outfile1.write(c)
+        data = nx.readwrite.json_graph.node_link_data(self.graph)
+        # serialization to JSON cannot work with sets
+        for node_data in data['nodes']:
+            node_data['descriptors'] = sorted(node_data['descriptors'])
+        with open(filename, 'w') as outfile1:
+            json.dump(data, outfile1)
 
     # Adds the node 'new_node' to the current graph
     def add_node(self, new_node):
         if self.valid_graph_node(new_node):
             self.graph.add_node(new_node.id_networkx, **new_node.__dict__)
-            self.nodes.add(new_node)
+            self._index_node(new_node)
+            self._ancestors[new_node.id_networkx] = set()
+            self._num_roots += 1
+
+    # Adds the nodes 'new_nodes' and the edges 'new_edges' to the current graph in one go
+    # The structure of the resulting graph is checked once at the end, while computing the ancestor sets,
+    # instead of edge by edge
+    # With validate=False the edges are trusted to be valid and only their type and endpoints are checked
+    def bulk_add(self, new_nodes, new_edges, validate=True):
+        new_nodes = list(new_nodes)
+        new_edges = list(new_edges)
+        new_ids = set()
+        new_synsets = set()
+        new_descriptors = set()
+        for new_node in new_nodes:
+            self.valid_graph_node(new_node)
+            if new_node.synset_name in new_synsets or not new_descriptors.isdisjoint(new_node.descriptors):
+                raise Exception("bulk_add: " + str(new_node) + " repeated among the new nodes")
+            new_ids.add(new_node.id_networkx)
+            new_synsets.add(new_node.synset_name)
+            new_descriptors |= new_node.descriptors
+        for new_edge in new_edges:
+            if not isinstance(new_edge, ConceptEdge):
+                raise Exception("bulk_add: invalid argument type")
+            for node in (new_edge.source, new_edge.target):
+                if node.id_networkx not in new_ids and node not in self:
+                    raise Exception("bulk_add: " + str(node) + " not in graph")
+            if validate and new_edge.source.synset_name not in new_edge.target._hypernym_names:
+                raise Exception("bulk_add: the source is not a hypernym of the target in " + str(new_edge))
+
+        added_edges = [edge for edge in new_edges if edge not in self]
+        self.graph.add_nodes_from((node.id_networkx, node.__dict__) for node in new_nodes)
+        self.graph.add_edges_from((edge.source.id_networkx, edge.target.id_networkx, self._edge_data(edge))
+                                  for edge in added_edges)
+        # the ancestor sets are needed anyway, so the pass computing them also checks the structure
+        try:
+            num_roots = sum(1 for id in self.graph if self.graph.in_degree(id) == 0)
+            if validate and num_roots > 1:
+                raise Exception("bulk_add: the resulting graph would have more than one root")
+            self._compute_ancestors(check=validate)
+        except Exception:
+            self.graph.remove_edges_from((edge.source.id_networkx, edge.target.id_networkx) for edge in added_edges)
+            self.graph.remove_nodes_from(new_ids)
+            raise
+        for new_node in new_nodes:
+            self._index_node(new_node)
+        self._num_roots = num_roots
 
     # Checks whether 'new_node' can be added to the current graph
     def valid_graph_node(self, new_node):
         if not isinstance(new_node, ConceptNode):
             raise Exception("valid_graph_node: invalid argument type")
         for descriptor in new_node.descriptors:
-            if descriptor in self.graph:        # ************** NEEDS __contains__
+            if descriptor in self._descriptor_index:
                 raise Exception("valid_graph_node: new node already in graph")
-        if new_node.synset_name in self.graph:  # ************** NEEDS __contains__
+        if new_node.synset_name in self._synset_index:
             raise Exception("valid_graph_node: synonym of new node already in graph")
         return True
 
     # Adds the edge 'new_edge' to the current graph
-    def add_edge(self, new_edge):
-        if self.valid_graph_edge(new_edge):
-            self.graph.add_edge(new_edge.source.id_networkx, new_edge.target.id_networkx)
-
-        if len(list(enumerate(nx.topological_generations(self.graph)))[0][1]) > 1:
-            self.graph.remove_edge(new_edge.source.id_networkx, new_edge.target.id_networkx)
+    # With validate=False only the type and endpoints of the edge are checked, for edges known to be valid
+    # such as those of a trusted bulk load (verify_integrity can then check the whole graph once)
+    def add_edge(self, new_edge, validate=True):
+        if validate:
+            self.valid_graph_edge(new_edge)
+        elif not isinstance(new_edge, ConceptEdge):
+            raise Exception("add_edge: invalid argument type")
+        elif new_edge.source not in self or new_edge.target not in self:
+            raise Exception("add_edge: " + str(new_edge) + " has an endpoint not in graph")
+        # the target stops being a root when it gets its first incoming edge
+        num_roots = self._num_roots - (self.graph.in_degree(new_edge.target.id_networkx) == 0)
+        if validate and num_roots > 1:
             raise Exception("add_edge: adding edge would create another root")
-        self.edges.add(new_edge)
+        self.graph.add_edge(new_edge.source.id_networkx, new_edge.target.id_networkx, **self._edge_data(new_edge))
+        self._num_roots = num_roots
+        self._propagate_ancestors(new_edge.source.id_networkx, new_edge.target.id_networkx)
+
+    # Edge attributes stored in the wrapped graph, the label only when there is one
+    @staticmethod
+    def _edge_data(edge):
+        return {} if edge.label is None else {'label': edge.label}
+
+    # Checks the whole current graph at once, e.g. after adding edges with validate=False:
+    # it must be a DAG with a single root which is its own transitive reduction
+    # and whose edges go from hypernym to hyponym
+    def verify_integrity(self):
+        self.valid_graph_structure(self.graph)
+        if sum(1 for id in self.graph if self.graph.in_degree(id) == 0) > 1:
+            raise Exception("verify_integrity: the graph has more than one root")
+        for source, target in self.graph.edges:
+            if self._id_to_node[source].synset_name not in self._id_to_node[target]._hypernym_names:
+                raise Exception("verify_integrity: " + self._id_to_node[source].synset_name
+                                + " is not a hypernym of " + self._id_to_node[target].synset_name)
+        return True
+
+    # Adds the ancestors gained through the edge source -> target to target and its descendants
+    def _propagate_ancestors(self, source_id, target_id):
+        new_ancestors = self._ancestors[source_id] | {source_id}
+        pending = [target_id]
+        while pending:
+            id = pending.pop()
+            # descendants of a node have at least its ancestors, so no need to go further down
+            if new_ancestors <= self._ancestors[id]:
+                continue
+            self._ancestors[id] |= new_ancestors
+            pending.extend(self.graph.successors(id))
 
     # Checks whether 'new_edge' can be added to the current graph
     def valid_graph_edge(self, new_edge):
@@ -223,16 +477,13 @@ class ConceptGraph:
         if new_edge.target not in self:
             raise Exception("valid_graph_edge: target node not in graph")
         # the synset of source is not a WordNet hypernym of that of target
-        # Note that hypernym_paths returns a list containing only one element which is a list of synsets
-        # In the following code, could use list comprehension instead of map
-        targetNode_hypernym_synset_names = list(map(lambda x: x.name(), wn.synset(new_edge.target.synset_name).hypernym_paths()[0]))
-        if new_edge.source.synset_name not in targetNode_hypernym_synset_names:
+        if new_edge.source.synset_name not in new_edge.target._hypernym_names:
             raise Exception("valid_graph_edge: the source is not a hypernym of the target")
         # the resulting graph would not be its own transitive reduction
-        if new_edge.source.id_networkx in nx.algorithms.dag.ancestors(self.graph, new_edge.target.id_networkx):
+        if new_edge.source.id_networkx in self._ancestors[new_edge.target.id_networkx]:
             raise Exception("valid_graph_edge: the graph already contains a path between the source and the target")
         # the resulting graph would not be a DAG (would have a cycle)
-        if new_edge.target.id_networkx in nx.algorithms.dag.ancestors(self.graph, new_edge.source.id_networkx):
+        if new_edge.target.id_networkx in self._ancestors[new_edge.source.id_networkx]:
             raise Exception("valid_graph_edge: the graph already contains a path between the target and the source")
         return True
 
@@ -254,47 +505,49 @@ class ConceptGraph:
 
     # Adds a new synonym to an existing node of the current graph
     def add_descriptor_to_node(self, descriptor, target_node):
-        if target_node not in self.graph:
+        if target_node not in self:
             raise Exception("add_descriptor:" + str(target_node) + "not in current graph")
+        owner = self._descriptor_index.get(descriptor)
+        if owner is not None and owner.id_networkx != target_node.id_networkx:
+            raise Exception("add_descriptor:" + descriptor + " already in another node of the current graph")
         try:
             target_node.add_descriptor(descriptor)
         except Exception as e:
             print(e)
-        self.graph.nodes[target_node.id_networkx]['descriptors'] \
-            = self.graph.nodes[target_node.id_networkx]['descriptors'].add(descriptor)
+        else:
+            self.graph.nodes[target_node.id_networkx]['descriptors'].add(descriptor)
+            self._descriptor_index[descriptor] = target_node
             
     #Uses matplotlib.pyplot to show a representation of the ConceptGraph using synset names as node labels
+    # Nodes and edges are never removed, so the layout only needs recomputing when their number changes
     def show(self):
-        levels = list(nx.topological_generations(self.graph))
-        for i in range(len(levels)):
-            for id in levels[i]:
-                self.graph.nodes[id]['depth'] = -i
-        layout = nx.multipartite_layout(self.graph, subset_key='depth', align='horizontal')
-        
-        id_to_synset = dict()
-        id_to_data = dict(self.graph.nodes.data())
-        for id in id_to_data.keys():
-            id_to_synset[id] = id_to_data[id]['synset_name']
-        
-        nx.draw_networkx(self.graph, labels=id_to_synset, pos=layout)
+        sig = (len(self.graph), self.graph.size())
+        if sig != self._layout_sig:
+            levels = list(nx.topological_generations(self.graph))
+            for i in range(len(levels)):
+                for id in levels[i]:
+                    self.graph.nodes[id]['depth'] = -i
+            self._layout_cache = nx.multipartite_layout(self.graph, subset_key='depth', align='horizontal')
+
+            self._labels_cache = dict(self.graph.nodes(data='synset_name'))
+            self._layout_sig = sig
+
+        nx.draw_networkx(self.graph, labels=self._labels_cache, pos=self._layout_cache)
         plt.show()
         plt.clf()
 
     def __contains__(self, elem):
         contains = False
         if type(elem) == str:
-            words = elem.split('.')
             # if string has syntax of a synset_name
-            if len(words) == 3:
+            if elem.count('.') == 2:
                 # contains = True if elem in synset_name from a node in graph
-                if elem in self.graph.nodes.synset_name():
-                    contains = True
+                contains = elem in self._synset_index
             else:
                 # contains = True if elem in descriptors from a node in graph
-                if elem in self.graph.nodes.descriptors():
-                    contains = True
+                contains = elem in self._descriptor_index
         elif isinstance(elem, ConceptNode):
-            contains = elem in self.nodes and elem.id_networkx in self.graph
+            contains = self._id_to_node.get(elem.id_networkx) == elem
         elif isinstance(elem, ConceptEdge):
-            contains = elem in self.edges and self.graph.has_edge(elem.source.id_networkx, elem.target.id_networkx)
+            contains = self.graph.has_edge(elem.source.id_networkx, elem.target.id_networkx)
         return contains
\ No newline at end of file
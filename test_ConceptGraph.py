@@ -0,0 +1,220 @@
+import json
+import networkx as nx
+import pytest
+
+import ConceptGraph as cg
+from ConceptGraph import ConceptEdge, ConceptGraph, ConceptNode
+
+
+# A tiny stand-in for WordNet: synset name -> hypernym path, word -> synset names
+HYPERNYM_PATHS = {
+    'entity.n.01': ['entity.n.01'],
+    'animal.n.01': ['entity.n.01', 'animal.n.01'],
+    'dog.n.01': ['entity.n.01', 'animal.n.01', 'dog.n.01'],
+    'mineral.n.01': ['entity.n.01', 'mineral.n.01'],
+}
+WORDS = {'entity': ['entity.n.01'], 'animal': ['animal.n.01'], 'dog': ['dog.n.01'], 'mineral': ['mineral.n.01'],
+         'beast': ['animal.n.01'], 'creature': ['animal.n.01', 'dog.n.01']}
+
+
+class FakeSynset:
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+    def pos(self):
+        return 'n'
+
+
+SYNSETS = {name: FakeSynset(name) for name in HYPERNYM_PATHS}
+
+
+@pytest.fixture
+def wordnet(monkeypatch):
+    monkeypatch.setattr(cg, '_cached_synset', lambda name: SYNSETS[name])
+    monkeypatch.setattr(cg, '_cached_synsets', lambda word: [SYNSETS[n] for n in WORDS.get(word, [])])
+    monkeypatch.setattr(cg, '_cached_hypernym_names', lambda name: frozenset(HYPERNYM_PATHS[name]))
+
+
+def make_nodes(*words):
+    return [ConceptNode.from_descriptor(word) for word in words]
+
+
+# The bitmask check, with the numba kernel (when numba is installed) or its plain Python version,
+# and the set-based check used outside bitmask_min_nodes..bitmask_max_nodes must all give the same results
+KERNELS = [cg._propagate_ancestor_bitmasks]
+if hasattr(cg._propagate_ancestor_bitmasks, 'py_func'):
+    KERNELS.append(cg._propagate_ancestor_bitmasks.py_func)
+
+
+@pytest.fixture(params=[('bitmask', kernel) for kernel in KERNELS] + [('sets', None)])
+def structure_check(request, monkeypatch):
+    mode, kernel = request.param
+    if mode == 'bitmask':
+        monkeypatch.setattr(ConceptGraph, 'bitmask_min_nodes', 0)
+        monkeypatch.setattr(cg, '_propagate_ancestor_bitmasks', kernel)
+    else:
+        monkeypatch.setattr(ConceptGraph, 'bitmask_max_nodes', 0)
+    return mode
+
+
+def test_valid_graph_structure_accepts_transitive_reduction(structure_check):
+    graph = nx.DiGraph([(1, 2), (1, 3), (2, 4), (3, 4)])
+    assert ConceptGraph.valid_graph_structure(graph)
+
+
+def test_valid_graph_structure_rejects_redundant_edge(structure_check):
+    graph = nx.DiGraph([(1, 2), (2, 3), (1, 3)])
+    with pytest.raises(Exception, match="another path between 1 and 3"):
+        ConceptGraph.valid_graph_structure(graph)
+
+
+def test_valid_graph_structure_rejects_cycle(structure_check):
+    graph = nx.DiGraph([(1, 2), (2, 3), (3, 1)])
+    with pytest.raises(Exception, match="cycle"):
+        ConceptGraph.valid_graph_structure(graph)
+
+
+def test_bulk_add_rolls_back_redundant_edge(wordnet, structure_check):
+    entity, animal, dog = make_nodes('entity', 'animal', 'dog')
+    graph = ConceptGraph([entity, animal], [ConceptEdge(entity, animal)])
+    with pytest.raises(Exception, match="another path"):
+        graph.bulk_add([dog], [ConceptEdge(animal, dog), ConceptEdge(entity, dog)])
+    assert dog not in graph and 'dog' not in graph
+    assert set(graph.graph) == {entity.id_networkx, animal.id_networkx}
+    assert graph.edges == {ConceptEdge(entity, animal)}
+    assert graph._ancestors[animal.id_networkx] == {entity.id_networkx}
+    graph.add_node(dog)
+    graph.add_edge(ConceptEdge(animal, dog))
+    assert graph._ancestors[dog.id_networkx] == {entity.id_networkx, animal.id_networkx}
+
+
+def test_bulk_add_rolls_back_extra_root(wordnet, structure_check):
+    entity, animal, mineral = make_nodes('entity', 'animal', 'mineral')
+    graph = ConceptGraph()
+    with pytest.raises(Exception, match="more than one root"):
+        graph.bulk_add([entity, animal, mineral], [ConceptEdge(entity, animal)])
+    assert len(graph.graph) == 0 and len(graph.nodes) == 0 and 'entity' not in graph
+
+
+def test_verify_integrity_after_trusted_load(wordnet, structure_check):
+    entity, animal, dog = make_nodes('entity', 'animal', 'dog')
+    graph = ConceptGraph()
+    graph.bulk_add([entity, animal, dog], [ConceptEdge(entity, animal), ConceptEdge(animal, dog)], validate=False)
+    assert graph.verify_integrity()
+    graph.add_edge(ConceptEdge(entity, dog), validate=False)
+    with pytest.raises(Exception, match="another path"):
+        graph.verify_integrity()
+
+
+def test_verify_integrity_rejects_extra_root(wordnet):
+    entity, animal, mineral = make_nodes('entity', 'animal', 'mineral')
+    graph = ConceptGraph()
+    graph.bulk_add([entity, animal, mineral], [ConceptEdge(entity, animal)], validate=False)
+    with pytest.raises(Exception, match="more than one root"):
+        graph.verify_integrity()
+
+
+def test_edge_equality_is_symmetric(wordnet):
+    entity, animal = make_nodes('entity', 'animal')
+    unlabelled, labelled = ConceptEdge(entity, animal), ConceptEdge(entity, animal, 'is-a')
+    assert unlabelled != labelled and labelled != unlabelled
+    assert len({unlabelled, labelled}) == len({labelled, unlabelled}) == 2
+    assert ConceptEdge(entity, animal) == unlabelled and ConceptEdge(animal, entity) != unlabelled
+
+
+def test_nodes_is_a_set_view(wordnet):
+    entity, animal, dog = make_nodes('entity', 'animal', 'dog')
+    graph = ConceptGraph([entity, animal], [ConceptEdge(entity, animal)])
+    assert graph.nodes == {entity, animal} and {entity, animal} == graph.nodes
+    assert animal in graph.nodes and dog not in graph.nodes and 'animal' not in graph.nodes
+    assert len(graph.nodes) == 2
+
+
+def make_graph():
+    entity, animal, dog = make_nodes('entity', 'animal', 'dog')
+    graph = ConceptGraph([entity, animal, dog], [ConceptEdge(entity, animal), ConceptEdge(animal, dog)])
+    return graph, entity, animal, dog
+
+
+def test_contains_descriptors_and_synset_names(wordnet):
+    graph, entity, animal, dog = make_graph()
+    assert 'dog' in graph and 'dog.n.01' in graph
+    assert 'mineral' not in graph and 'mineral.n.01' not in graph
+
+
+def test_add_node_rejects_repeated_descriptor_or_synset(wordnet):
+    entity, animal = make_nodes('entity', 'animal')
+    graph = ConceptGraph([entity, animal], [ConceptEdge(entity, animal)])
+    with pytest.raises(Exception, match="synonym of new node already in graph"):
+        graph.add_node(ConceptNode({'beast'}, 'animal.n.01'))
+    graph.add_descriptor_to_node('creature', animal)
+    # dog.n.01 is not in the graph yet, but its descriptor 'creature' already belongs to animal
+    with pytest.raises(Exception, match="^valid_graph_node: new node already in graph"):
+        graph.add_node(ConceptNode({'creature'}, 'dog.n.01'))
+    assert len(graph.nodes) == 2 and 'dog.n.01' not in graph
+
+
+def test_add_descriptor_to_node_refuses_descriptor_of_another_node(wordnet):
+    graph, entity, animal, dog = make_graph()
+    graph.add_descriptor_to_node('creature', animal)
+    with pytest.raises(Exception, match="already in another node"):
+        graph.add_descriptor_to_node('creature', dog)
+    assert 'creature' not in dog.descriptors and graph._descriptor_index['creature'] is animal
+
+
+def test_add_descriptor_to_node_updates_node_and_graph(wordnet, tmp_path):
+    graph, entity, animal, dog = make_graph()
+    graph.add_descriptor_to_node('beast', animal)
+    assert animal.descriptors == {'animal', 'beast'}
+    assert graph.graph.nodes[animal.id_networkx]['descriptors'] == {'animal', 'beast'}
+    assert 'beast' in graph
+    filename = tmp_path / 'graph.json'
+    graph.write_to_json(filename)
+    data = json.loads(filename.read_text())
+    descriptors = {node['synset_name']: node['descriptors'] for node in data['nodes']}
+    assert descriptors['animal.n.01'] == ['animal', 'beast']
+
+
+def test_json_round_trip_keeps_structure_and_labels(wordnet, tmp_path):
+    entity, animal, dog = make_nodes('entity', 'animal', 'dog')
+    graph = ConceptGraph([entity, animal, dog], [ConceptEdge(entity, animal, 'is-a'), ConceptEdge(animal, dog)])
+    graph.add_descriptor_to_node('beast', animal)
+    filename = tmp_path / 'graph.json'
+    graph.write_to_json(filename)
+    loaded = ConceptGraph.from_json(filename.read_text())
+    by_synset = {node.synset_name: node for node in loaded.nodes}
+    assert {name: node.descriptors for name, node in by_synset.items()} == \
+           {'entity.n.01': {'entity'}, 'animal.n.01': {'animal', 'beast'}, 'dog.n.01': {'dog'}}
+    assert loaded.edges == {ConceptEdge(by_synset['entity.n.01'], by_synset['animal.n.01'], 'is-a'),
+                            ConceptEdge(by_synset['animal.n.01'], by_synset['dog.n.01'])}
+    assert loaded.verify_integrity()
+
+
+def test_constructor_rejects_graph_without_matching_nodes(wordnet):
+    entity, animal = make_nodes('entity', 'animal')
+    digraph = nx.DiGraph([(entity.id_networkx, animal.id_networkx)])
+    with pytest.raises(Exception, match="nodes must be exactly the nodes of the graph"):
+        ConceptGraph(graph=digraph)
+    with pytest.raises(Exception, match="nodes must be exactly the nodes of the graph"):
+        ConceptGraph([entity], graph=digraph)
+    with pytest.raises(Exception, match="edges cannot be given together with a graph"):
+        ConceptGraph([entity, animal], [ConceptEdge(entity, animal)], graph=digraph)
+    assert ConceptGraph([entity, animal], graph=digraph).edges == {ConceptEdge(entity, animal)}
+
+
+def test_graphs_do_not_share_state():
+    first, second = ConceptGraph(), ConceptGraph()
+    assert first.graph is not second.graph
+    assert first._id_to_node is not second._id_to_node
+    assert first._descriptor_index is not second._descriptor_index
+    assert first._synset_index is not second._synset_index
+    assert first._ancestors is not second._ancestors
+
+
+def test_getNodeFromId_is_deprecated(wordnet):
+    entity, animal = make_nodes('entity', 'animal')
+    with pytest.deprecated_call():
+        assert ConceptGraph.getNodeFromId(animal.id_networkx, {entity, animal}) is animal